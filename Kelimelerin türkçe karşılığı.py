@@ -1,4 +1,5 @@
 import json
+from Normalleştirme import normalize_keys, prepare, replace_matches
 
 # JSON dosyasını okuyarak sözlüğü yükleme fonksiyonu
 def load_kayseri_words(filepath):
@@ -6,16 +7,16 @@ def load_kayseri_words(filepath):
         return json.load(file)
 
 # Şive dönüştürme fonksiyonu
+# word_dict, normalize_keys ile yükleme anında normalleştirilmiş sözlüktür;
+# anahtarlar kelime başında ekli hâlleriyle de eşleşir ve metnin büyük/küçük harfleri korunur
 def convert_shive_to_standard(text, word_dict):
-    for key, value in word_dict.items():
-        if key in text:
-            text = text.replace(key, value)
-    return text
+    text_cleaned, text_folded = prepare(text, lower=False)
+    return replace_matches(text_cleaned, text_folded, word_dict, whole_word=False)
 
 # Tam uygulama
 def main():
     # JSON dosyasından kelimeleri yükle
-    kayseri_to_standard = load_kayseri_words('Lehçe.json')
+    kayseri_to_standard = normalize_keys(load_kayseri_words('Lehçe.json'))
     
     while True:
         # Kullanıcıdan şive ile metin al
@@ -5,7 +5,7 @@ from tensorflow.keras.models import load_model
 import librosa
 import tempfile
 import json
-import re
+from Normalleştirme import normalize, normalize_keys, prepare, replace_matches
 import os
 import pygame
 
@@ -22,22 +22,19 @@ def load_json(filepath):
         return json.load(file)
 
 # Şive dönüştürme fonksiyonu
+# word_dict, normalize_keys ile yükleme anında normalleştirilmiş sözlüktür
 def convert_shive_to_standard(text, word_dict):
-    text_cleaned = text.lower().strip()
-    for key, value in word_dict.items():
-        key_cleaned = key.lower().strip()
-        if key_cleaned in text_cleaned:
-            text_cleaned = re.sub(r'\b{}\b'.format(re.escape(key_cleaned)), value, text_cleaned, flags=re.IGNORECASE)
-    return text_cleaned
+    text_cleaned, text_folded = prepare(text)
+    return replace_matches(text_cleaned, text_folded, word_dict)
 
 # Cevap üretim fonksiyonu
 def generate_response(standard_text, responses):
-    standard_text = standard_text.lower().strip()
-    for key, response in responses.items():
-        key_cleaned = key.lower().strip()
+    standard_text = normalize(standard_text)
+    for key_cleaned, (_, response) in responses.items():
         if key_cleaned in standard_text:
             return response
-    return responses.get("default", "Bu konu hakkında ne söyleyeceğimi bilemiyorum.")
+    _, response = responses.get("default", ("default", "Bu konu hakkında ne söyleyeceğimi bilemiyorum."))
+    return response
 
 # Mikrofonla ses kaydetme
 def record_audio(duration=5, samplerate=16000):
@@ -87,8 +84,8 @@ def play_audio_response(response_text, audio_files):
 # Tam uygulama
 def main():
     # JSON dosyalarından kelimeleri, yanıtları ve ses dosyalarını yükle
-    kayseri_to_standard = load_json('Sorular.json')
-    responses = load_json('Soru-Cevap.json')
+    kayseri_to_standard = normalize_keys(load_json('Sorular.json'))
+    responses = normalize_keys(load_json('Soru-Cevap.json'))
     audio_files = load_json('Ses_Dosyası.json')  # Ses dosyalarının JSON dosyasını yükleyin
     
     # Mikrofonla ses kaydetme
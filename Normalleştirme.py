@@ -0,0 +1,74 @@
+import re
+import unicodedata
+
+# Türkçe küçük harf ve aksan katlama tabloları (bir kez oluşturulur)
+# Python'un lower() fonksiyonu "I" -> "i" ve "İ" -> "i̇" yaptığı için bu harfler ayrıca eşlenir
+# Tablolar karakter başına tek karakter ürettiği için metnin uzunluğunu korur;
+# böylece katlanmış metinde bulunan eşleşme konumları orijinal metinde de geçerlidir
+_turkish_lower = {'I': 'ı', 'İ': 'i'}
+
+def _build_tables():
+    lower_table = {}
+    folding_table = {}
+    for code in range(0x250):
+        char = chr(code)
+        lowered = _turkish_lower.get(char, char.lower())
+        if len(lowered) != 1:
+            continue
+        # Aksanlı harfleri temel harfe indirme (ç -> c, ğ -> g, ö -> o, ş -> s, ü -> u);
+        # ı ve i ayrı harfler olduğu için (kır/kir) ı katlanmaz
+        folded = unicodedata.normalize('NFD', lowered)[0]
+        if lowered != char:
+            lower_table[code] = lowered
+        if folded != char:
+            folding_table[code] = folded
+    return lower_table, folding_table
+
+LOWER_TABLE, NORMALIZATION_TABLE = _build_tables()
+
+# Metni gösterim ve eşleştirme biçimlerine ayırma
+# Ayrışmış (NFD) girdiler önce birleştirilir; gösterim metni yalnızca küçük harfe çevrilir
+def prepare(text, lower=True):
+    text = unicodedata.normalize('NFC', text).strip()
+    display = text.translate(LOWER_TABLE) if lower else text
+    return display, text.translate(NORMALIZATION_TABLE)
+
+# Metni tek bir str.translate geçişiyle eşleştirme biçimine getirme
+def normalize(text):
+    return prepare(text)[1]
+
+# Kelime içinde (ekli hâliyle) eşleşebilecek en kısa anahtar; daha kısa anahtarlar
+# (aba, ağa, dal, eme...) yalnızca tam kelime olarak eşleşir
+MIN_PREFIX_LENGTH = 4
+
+# Sözlük anahtarlarını yükleme anında normalleştirme
+# Sözlük: normalleştirilmiş anahtar -> (orijinal anahtar, değer); tüm anahtarları tek
+# geçişte bulan düzenli ifade ilk kullanımda bir kez derlenir
+class NormalizedKeys(dict):
+    def __init__(self, word_dict):
+        super().__init__((normalize(key), (key, value)) for key, value in word_dict.items())
+        self._patterns = {}
+
+    def pattern(self, whole_word=True):
+        if whole_word not in self._patterns:
+            # Uzun anahtarlar önce denenir; kelime başı sınırı her zaman gereklidir
+            alternatives = []
+            for key in sorted(filter(None, self), key=len, reverse=True):
+                end = r'\b' if whole_word or len(key) < MIN_PREFIX_LENGTH else ''
+                alternatives.append(re.escape(key) + end)
+            self._patterns[whole_word] = re.compile(r'\b(?:{})'.format('|'.join(alternatives)) if alternatives else r'(?!)')
+        return self._patterns[whole_word]
+
+def normalize_keys(word_dict):
+    return NormalizedKeys(word_dict)
+
+# Anahtarları katlanmış metinde tek geçişte bulup gösterim metninde değiştirme
+# Eklenen değerler yeniden taranmaz
+def replace_matches(display, folded, word_dict, whole_word=True):
+    parts, last = [], 0
+    for match in word_dict.pattern(whole_word).finditer(folded):
+        _, value = word_dict[match.group()]
+        parts += [display[last:match.start()], value]
+        last = match.end()
+    parts.append(display[last:])
+    return ''.join(parts)
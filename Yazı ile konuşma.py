@@ -1,5 +1,5 @@
 import json
-import re
+from Normalleştirme import normalize, normalize_keys, prepare, replace_matches
 
 # JSON dosyasını okuyarak sözlüğü yükleme fonksiyonu
 def load_json(filepath):
@@ -7,32 +7,25 @@ def load_json(filepath):
         return json.load(file)
 
 # Şive dönüştürme fonksiyonu
+# word_dict, normalize_keys ile yükleme anında normalleştirilmiş sözlüktür
 def convert_shive_to_standard(text, word_dict):
-    # Anahtar kelimeleri ve değerleri küçük harfe çevirip, boşlukları temizle
-    text_cleaned = text.lower().strip()
-    for key, value in word_dict.items():
-        key_cleaned = key.lower().strip()
-        # Anahtar kelimenin metnin içinde olup olmadığını kontrol et
-        if key_cleaned in text_cleaned:
-            text_cleaned = re.sub(r'\b{}\b'.format(re.escape(key_cleaned)), value, text_cleaned, flags=re.IGNORECASE)
-    return text_cleaned
+    text_cleaned, text_folded = prepare(text)
+    return replace_matches(text_cleaned, text_folded, word_dict)
 
 # Cevap üretim fonksiyonu
 def generate_response(standard_text, responses):
-    # Küçük harfe çevir ve boşlukları temizle
-    standard_text = standard_text.lower().strip()
-    for key, response in responses.items():
-        # Anahtar kelimeleri küçük harfe çevirip, boşlukları temizle
-        key_cleaned = key.lower().strip()
+    standard_text = normalize(standard_text)
+    for key_cleaned, (_, response) in responses.items():
         if key_cleaned in standard_text:
             return response
-    return responses.get("default", "Bu konu hakkında ne söyleyeceğimi bilemiyorum.")
+    _, response = responses.get("default", ("default", "Bu konu hakkında ne söyleyeceğimi bilemiyorum."))
+    return response
 
 # Tam uygulama
 def main():
     # JSON dosyasından kelimeleri ve yanıtları yükle
-    kayseri_to_standard = load_json('Sorular.json')
-    responses = load_json('Soru-Cevap.json')
+    kayseri_to_standard = normalize_keys(load_json('Sorular.json'))
+    responses = normalize_keys(load_json('Soru-Cevap.json'))
     
     while True:
         # Kullanıcıdan şive ile metin al
@@ -0,0 +1,431 @@
+import argparse
+import glob
+import importlib.util
+import json
+import math
+import os
+import random
+import struct
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+import wave
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from Normalleştirme import normalize_keys
+
+# Yük testi: kaydedilmiş oturumları (yazılı şiveli cümleler, audio_files/ klipleri
+# ve sentetik sesler) belirli eşzamanlılık ve geliş hızıyla tekrar oynatır.
+# Örnek: python Yük_Testi.py --concurrency 1,2,4,8 --duration 30 --voice
+
+audio_dir = 'audio_files/'
+transcript_path = 'transcripts.json'
+
+# JSON dosyasını okuyarak sözlüğü yükleme fonksiyonu
+def load_json(filepath):
+    with open(filepath, 'r', encoding='utf-8') as file:
+        return json.load(file)
+
+# Dosya adında boşluk olan betikleri modül olarak yükleme
+def load_module(filepath, name):
+    spec = importlib.util.spec_from_file_location(name, filepath)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+# Sentetik ses dosyası üretme (sinüs + gürültü, 16 kHz mono)
+def write_synthetic_audio(filename, duration, samplerate=16000):
+    frequency = random.uniform(120, 300)
+    frames = bytearray()
+    for i in range(int(duration * samplerate)):
+        sample = 0.5 * math.sin(2 * math.pi * frequency * i / samplerate) + random.uniform(-0.1, 0.1)
+        frames += struct.pack('<h', int(sample * 32767))
+    with wave.open(filename, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(samplerate)
+        wav_file.writeframes(bytes(frames))
+    return filename
+
+# Varsayılan oturum derlemini depodaki verilerden oluşturma
+# Her oturum bir tur listesidir; tur ("text" | "audio", içerik) çiftidir
+def build_corpus(voice, synthetic_dir, synthetic_count=5, turns_per_session=3):
+    sentences = list(load_json('Sorular.json').keys())
+    sessions = []
+    for _ in range(len(sentences)):
+        sessions.append([('text', random.choice(sentences)) for _ in range(turns_per_session)])
+    if not voice:
+        return sessions
+
+    clips = [os.path.join(audio_dir, file_name) for file_name in load_json(transcript_path)]
+    clips = [clip for clip in clips if os.path.exists(clip)]
+    for _ in range(len(clips) // turns_per_session):
+        sessions.append([('audio', random.choice(clips)) for _ in range(turns_per_session)])
+
+    for i in range(synthetic_count):
+        filename = os.path.join(synthetic_dir, f'sentetik_{i}.wav')
+        write_synthetic_audio(filename, duration=random.uniform(1.0, 3.0))
+        sessions.append([('audio', filename)])
+    return sessions
+
+# Kullanıcının verdiği derlemi okuma
+# Biçim: [[{"text": "Nörüyon"}, {"audio": "audio_files/Gel (1).wav"}, {"synthetic": 2.0}], ...]
+def load_corpus(filepath, synthetic_dir):
+    sessions = []
+    for raw_session in load_json(filepath):
+        session = []
+        for turn in raw_session:
+            if 'text' in turn:
+                session.append(('text', turn['text']))
+            elif 'audio' in turn:
+                session.append(('audio', turn['audio']))
+            elif 'synthetic' in turn:
+                filename = os.path.join(synthetic_dir, f'sentetik_{len(os.listdir(synthetic_dir))}.wav')
+                session.append(('audio', write_synthetic_audio(filename, float(turn['synthetic']))))
+            else:
+                raise ValueError(f"Bilinmeyen tur biçimi: {turn}")
+        sessions.append(session)
+    return sessions
+
+# Süreç içi hedef: convert_shive_to_standard, generate_response ve recognize_speech
+class InProcessTarget:
+    def __init__(self, voice):
+        self.text_module = load_module('Yazı ile konuşma.py', 'yazi_ile_konusma')
+        # Konuşma_Kodu modeli içe aktarılırken yüklediği için yalnızca sesli testte yüklenir
+        self.voice_module = load_module('Konuşma_Kodu.py', 'konusma_kodu') if voice else None
+        self.kayseri_to_standard = normalize_keys(load_json('Sorular.json'))
+        self.responses = normalize_keys(load_json('Soru-Cevap.json'))
+
+    def run_turn(self, kind, payload):
+        if kind == 'audio':
+            if self.voice_module is None:
+                raise RuntimeError("Sesli turlar için --voice gerekli")
+            payload = self.voice_module.recognize_speech(payload)
+        standard_text = self.text_module.convert_shive_to_standard(payload, self.kayseri_to_standard)
+        return self.text_module.generate_response(standard_text, self.responses)
+
+# Yerel sunucu hedefi: yazılı turlar JSON {"text": ...}, sesli turlar ham WAV olarak gönderilir
+class HttpTarget:
+    def __init__(self, url, timeout=30):
+        self.url = url
+        self.timeout = timeout
+
+    def run_turn(self, kind, payload):
+        if kind == 'audio':
+            with open(payload, 'rb') as audio_file:
+                data = audio_file.read()
+            content_type = 'audio/wav'
+        else:
+            data = json.dumps({'text': payload}).encode('utf-8')
+            content_type = 'application/json'
+        request = urllib.request.Request(self.url, data=data, headers={'Content-Type': content_type})
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return response.read()
+
+# Süreç içi testte her işçi süreç kendi hedefini bir kez yükler; böylece saf Python
+# metin hattı GIL yüzünden tek çekirdekle sınırlı kalmaz
+_worker_target = None
+
+def init_worker(voice):
+    global _worker_target
+    _worker_target = InProcessTarget(voice)
+
+def worker_ready():
+    time.sleep(0.1)
+    return os.getpid()
+
+# Sürecin toplam CPU süresi (sn); pid verilirse /proc/<pid>/stat okunur
+def process_cpu_seconds(pid=None):
+    if pid is None:
+        return sum(os.times()[:2])
+    with open(f'/proc/{pid}/stat') as stat:
+        fields = stat.read().rsplit(')', 1)[1].split()
+    # utime ve stime alanları (14. ve 15.) saat tıkı cinsindendir
+    return (int(fields[11]) + int(fields[12])) / os.sysconf('SC_CLK_TCK')
+
+# Anlık RSS (MB); pid verilirse /proc/<pid>/statm okunur
+def process_rss_mb(pid=None):
+    try:
+        with open(f"/proc/{pid or 'self'}/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 1024 / 1024
+    except OSError:
+        if pid is not None:
+            raise
+    # /proc olmayan sistemlerde yalnızca tepe RSS bilinir; Windows'ta resource modülü yoktur
+    try:
+        import resource
+    except ImportError:
+        return float('nan')
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss macOS'ta bayt, diğer sistemlerde KB cinsindendir
+    return peak / 1024 / 1024 if sys.platform == 'darwin' else peak / 1024
+
+# Bu sürecin alt süreçleri (işçiler); /proc olmayan sistemlerde boş liste döner
+def child_pids():
+    pids = []
+    for children in glob.glob('/proc/self/task/*/children'):
+        try:
+            with open(children) as file:
+                pids += [int(pid) for pid in file.read().split()]
+        except OSError:
+            continue
+    return pids
+
+# CPU ve RSS değerlerini belirli aralıklarla örnekleme
+# CPU, makinenin tüm çekirdeklerine oranla verilir (100% = bütün çekirdekler dolu)
+class ResourceSampler(threading.Thread):
+    def __init__(self, interval=1.0, pid=None, include_children=False):
+        super().__init__(daemon=True)
+        self.interval = interval
+        self.pid = pid
+        self.include_children = include_children
+        self.cpu_count = os.cpu_count() or 1
+        self.samples = []
+        self.stop_event = threading.Event()
+
+    def sample_pids(self):
+        if self.pid is not None:
+            return [self.pid]
+        return [None] + (child_pids() if self.include_children else [])
+
+    def sample(self, function):
+        values = {}
+        for pid in self.sample_pids():
+            try:
+                values[pid] = function(pid)
+            except OSError:
+                continue
+        return values
+
+    def run(self):
+        start = time.perf_counter()
+        last_wall = start
+        last_cpu = self.sample(process_cpu_seconds)
+        while not self.stop_event.wait(self.interval):
+            wall = time.perf_counter()
+            cpu = self.sample(process_cpu_seconds)
+            busy = sum(seconds - last_cpu.get(pid, seconds) for pid, seconds in cpu.items())
+            cpu_percent = 100 * busy / ((wall - last_wall) * self.cpu_count)
+            rss = sum(self.sample(process_rss_mb).values())
+            self.samples.append((wall - start, cpu_percent, rss))
+            last_wall, last_cpu = wall, cpu
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+# Bir oturumu sırayla oynatma; ilk turun gecikmesi kuyrukta bekleme süresini de içerir
+# target None ise işçi sürecin hedefi kullanılır; perf_counter süreçler arasında ortaktır
+def run_session(target, session, arrival_time):
+    target = target or _worker_target
+    results = []
+    turn_start = arrival_time
+    for kind, payload in session:
+        error = None
+        try:
+            target.run_turn(kind, payload)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        turn_end = time.perf_counter()
+        results.append((kind, turn_end - turn_start, error))
+        turn_start = turn_end
+    return results
+
+# Eşzamanlılık seviyesi için yürütücü hazırlama
+# Yerel sunucuya istekler iş parçacıklarıyla, süreç içi hedef işçi süreçlerle çalıştırılır;
+# işçiler ölçüm başlamadan önce başlatılıp hedeflerini yükler
+def start_executor(url, voice, concurrency):
+    if url:
+        return ThreadPoolExecutor(max_workers=concurrency), HttpTarget(url)
+    executor = ProcessPoolExecutor(max_workers=concurrency, initializer=init_worker, initargs=(voice,))
+    for future in [executor.submit(worker_ready) for _ in range(concurrency)]:
+        future.result()
+    return executor, None
+
+# Belirli eşzamanlılıkta yük üretme
+# rate > 0 ise oturumlar Poisson süreciyle gelir (açık döngü), aksi halde
+# her kullanıcı bir öncekini bitirir bitirmez yeni oturum başlatır (kapalı döngü)
+def run_load(executor, target, sessions, concurrency, rate=0.0, duration=30.0, max_sessions=None,
+             sample_interval=1.0, pid=None, include_children=False):
+    slots = threading.Semaphore(concurrency)
+    submitted = []
+    sampler = ResourceSampler(sample_interval, pid, include_children)
+    sampler.start()
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        if max_sessions is not None and len(submitted) >= max_sessions:
+            break
+        if rate > 0:
+            time.sleep(random.expovariate(rate))
+        else:
+            slots.acquire()
+        session = random.choice(sessions)
+        future = executor.submit(run_session, target, session, time.perf_counter())
+        if rate <= 0:
+            future.add_done_callback(lambda _: slots.release())
+        submitted.append((future, session))
+    # Açık döngüde süre dolduğunda kuyrukta bekleyen oturumlar iptal edilir; geliş hızı
+    # kapasiteyi aşarsa kuyruk birikir ve seviye süreyi çok aşardı. Kapalı döngüde en
+    # fazla concurrency oturum bekler, bunlar tamamlanır
+    executor.shutdown(wait=True, cancel_futures=rate > 0)
+    elapsed = time.perf_counter() - start
+    sampler.stop()
+
+    results = []
+    dropped = 0
+    for future, session in submitted:
+        if future.cancelled():
+            dropped += 1
+        elif future.exception() is not None:
+            error = f"{type(future.exception()).__name__}: {future.exception()}"
+            results += [(kind, 0.0, error) for kind, _ in session]
+        else:
+            results += future.result()
+    return summarize(results, sampler.samples, elapsed, concurrency, len(submitted), dropped)
+
+# Sıralı listeden yüzdelik değeri (en yakın sıra yöntemi)
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return float('nan')
+    index = max(0, math.ceil(p / 100 * len(sorted_values)) - 1)
+    return sorted_values[index]
+
+# Verim ve gecikme yalnızca başarılı turlardan hesaplanır (goodput);
+# hızla başarısız olan istekler sunucu kapalıyken bile yüksek verim gösterirdi
+def turn_stats(results, elapsed):
+    latencies = sorted(latency for _, latency, error in results if error is None)
+    stats = {
+        'turns': len(results),
+        'goodput_tps': len(latencies) / elapsed if elapsed else 0.0,
+        'error_rate': (len(results) - len(latencies)) / len(results) if results else 0.0,
+    }
+    for p in (50, 90, 95, 99, 100):
+        stats[f'p{p}_ms'] = percentile(latencies, p) * 1000
+    return stats
+
+# Yazılı ve sesli turların gecikmeleri çok farklı olduğu için ayrıca özetlenir
+def summarize(results, samples, elapsed, concurrency, sessions, dropped):
+    errors = [error for _, _, error in results if error is not None]
+    summary = {
+        'concurrency': concurrency,
+        'sessions': sessions,
+        'dropped_sessions': dropped,
+        'elapsed_s': elapsed,
+        'first_errors': sorted(set(errors))[:5],
+        'samples': samples,
+    }
+    summary.update(turn_stats(results, elapsed))
+    summary['kinds'] = {}
+    for kind in sorted({kind for kind, _, _ in results}):
+        summary['kinds'][kind] = turn_stats([result for result in results if result[0] == kind], elapsed)
+    if samples:
+        summary['cpu_percent_mean'] = sum(cpu for _, cpu, _ in samples) / len(samples)
+        summary['rss_mb_max'] = max(rss for _, _, rss in samples)
+    return summary
+
+kind_labels = {'text': 'Yazı', 'audio': 'Ses'}
+
+def print_summary(summary, show_samples=False, scope='süreç içi'):
+    print(f"Eşzamanlılık: {summary['concurrency']}  Oturum: {summary['sessions']}  İptal: {summary['dropped_sessions']}  "
+          f"Tur: {summary['turns']}  Süre: {summary['elapsed_s']:.1f} sn")
+    for kind, stats in summary['kinds'].items():
+        print(f"{kind_labels.get(kind, kind)}: başarılı verim {stats['goodput_tps']:.2f} tur/sn  hata oranı {stats['error_rate']:.2%}  "
+              f"gecikme (ms) p50 {stats['p50_ms']:.1f}  p90 {stats['p90_ms']:.1f}  p95 {stats['p95_ms']:.1f}  "
+              f"p99 {stats['p99_ms']:.1f}  max {stats['p100_ms']:.1f}")
+    if 'cpu_percent_mean' in summary:
+        print(f"CPU ortalama ({scope}): {summary['cpu_percent_mean']:.0f}% / {os.cpu_count() or 1} çekirdek  "
+              f"RSS en yüksek: {summary['rss_mb_max']:.0f} MB")
+    for error in summary['first_errors']:
+        print(f"Hata: {error}")
+    if show_samples:
+        print(f"  zaman(sn)  cpu(%)  rss(MB)  [{scope}]")
+        for t, cpu, rss in summary['samples']:
+            print(f"  {t:9.1f}  {cpu:6.0f}  {rss:7.0f}")
+
+# Doyma noktası: her tur türü için hatasız, p95 gecikmesi ilk seviyeye göre fazla
+# büyümemiş ve başarılı verimi önceki seviyeye göre en az %10 artmış son seviye
+# Dönen değerler: son sağlıklı seviye, koşulları ilk bozan seviye ve nedeni
+def find_saturation(summaries, max_error_rate=0.0, max_p95_growth=2.0):
+    baseline_p95 = {}
+    best = None
+    for summary in summaries:
+        if summary['dropped_sessions']:
+            return best, summary, f"süre dolduğunda {summary['dropped_sessions']} oturum kuyrukta bekliyordu"
+        for kind, stats in summary['kinds'].items():
+            label = kind_labels.get(kind, kind)
+            if stats['error_rate'] > max_error_rate:
+                return best, summary, f"{label} hata oranı {stats['error_rate']:.2%} (sınır {max_error_rate:.2%})"
+            if kind not in baseline_p95:
+                # Çok hızlı hedeflerde p95 sıfıra yakın olduğundan taban en az 1 ms alınır
+                baseline_p95[kind] = max(stats['p95_ms'], 1.0)
+            elif stats['p95_ms'] > baseline_p95[kind] * max_p95_growth:
+                return best, summary, (f"{label} p95 gecikmesi {stats['p95_ms']:.1f} ms, ilk seviyenin "
+                                       f"{stats['p95_ms'] / baseline_p95[kind]:.1f} katı (sınır {max_p95_growth:.1f})")
+            if best is not None and kind in best['kinds']:
+                previous = best['kinds'][kind]['goodput_tps']
+                if stats['goodput_tps'] < previous * 1.1:
+                    return best, summary, (f"{label} başarılı verimi {previous:.2f} -> {stats['goodput_tps']:.2f} "
+                                           f"tur/sn, %10'dan az arttı")
+        best = summary
+    return best, None, None
+
+# Tam uygulama
+def main():
+    parser = argparse.ArgumentParser(description="Yazılı ve sesli konuşma hatları için yük testi")
+    parser.add_argument('--concurrency', default='1,2,4,8', help="Virgülle ayrılmış eşzamanlı kullanıcı sayıları")
+    parser.add_argument('--rate', type=float, default=0.0, help="Saniyede yeni oturum sayısı (0: kapalı döngü)")
+    parser.add_argument('--duration', type=float, default=30.0, help="Her seviye için test süresi (sn)")
+    parser.add_argument('--sessions', type=int, default=None, help="Her seviye için en fazla oturum sayısı")
+    parser.add_argument('--voice', action='store_true', help="audio_files/ klipleri ve sentetik sesleri de oynat")
+    parser.add_argument('--corpus', help="Oturum derlemi JSON dosyası")
+    parser.add_argument('--url', help="Süreç içi fonksiyonlar yerine yerel sunucuya gönder")
+    parser.add_argument('--pid', type=int, help="CPU/RSS değerleri örneklenecek sunucu süreci (/proc gerekir)")
+    parser.add_argument('--max-error-rate', type=float, default=0.0, help="Doyma için izin verilen en yüksek hata oranı")
+    parser.add_argument('--max-p95-growth', type=float, default=2.0, help="Doyma için ilk seviyeye göre izin verilen p95 artış katı")
+    parser.add_argument('--sample-interval', type=float, default=1.0, help="CPU/RSS örnekleme aralığı (sn)")
+    parser.add_argument('--samples', action='store_true', help="CPU/RSS zaman serisini yazdır")
+    parser.add_argument('--output', help="Sonuçların yazılacağı JSON dosyası")
+    args = parser.parse_args()
+    if args.pid is not None and not os.path.exists(f'/proc/{args.pid}/stat'):
+        parser.error(f"/proc/{args.pid} bulunamadı")
+
+    # CPU/RSS değerlerinin hangi sürece ait olduğu
+    if args.pid is not None:
+        scope = f'sunucu, pid {args.pid}'
+    elif args.url:
+        scope = 'istemci (yük üreticisi)'
+    else:
+        scope = 'yük üreticisi ve işçi süreçleri'
+
+    # Sentetik sesler için geçici dizin test bitince silinir
+    with tempfile.TemporaryDirectory(prefix='yuk_testi_') as synthetic_dir:
+        sessions = load_corpus(args.corpus, synthetic_dir) if args.corpus else build_corpus(args.voice, synthetic_dir)
+        voice = args.voice or any(kind == 'audio' for session in sessions for kind, _ in session)
+
+        summaries = []
+        for concurrency in [int(level) for level in args.concurrency.split(',')]:
+            executor, target = start_executor(args.url, voice, concurrency)
+            summary = run_load(executor, target, sessions, concurrency, args.rate, args.duration, args.sessions,
+                               args.sample_interval, args.pid, include_children=not args.url)
+            summary['resource_scope'] = scope
+            print_summary(summary, args.samples, scope)
+            print()
+            summaries.append(summary)
+
+    best, degraded, reason = find_saturation(summaries, args.max_error_rate, args.max_p95_growth)
+    if best is None:
+        print(f"İlk seviyede bile {reason}; doyma noktası belirlenemedi")
+    elif degraded is None:
+        print(f"Doyma noktasına ulaşılmadı; en yüksek seviye {best['concurrency']} eşzamanlı kullanıcı "
+              f"({best['goodput_tps']:.2f} tur/sn)")
+    else:
+        print(f"Doyma noktası: yaklaşık {best['concurrency']} eşzamanlı kullanıcı "
+              f"({best['goodput_tps']:.2f} tur/sn); {degraded['concurrency']} kullanıcıda {reason}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as file:
+            json.dump(summaries, file, ensure_ascii=False, indent=4)
+
+if __name__ == "__main__":
+    main()